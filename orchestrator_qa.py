@@ -0,0 +1,89 @@
+"""
+QA comparison core for the provider validation workflow.
+
+This module is deliberately self-contained and fully annotated so it can be
+compiled to a C extension with mypyc for a 2-5x speedup on the string-heavy
+comparison loop:
+
+    pip install mypy
+    mypyc orchestrator_qa.py
+
+The produced .so shadows this file on import, so the pure-Python version
+remains the fallback wherever the compiled extension isn't built.
+"""
+
+# Fields the QA node compares between database and scraped records
+FIELDS_TO_COMPARE = (
+    "name", "specialty", "phone", "address", "city", "state", "zip",
+    "license_number", "npi"
+)
+
+# Per-field confidence penalties: identity fields (name, license, NPI) weigh
+# more than contact fields, which in turn weigh more than formatting-prone
+# address lines
+_FIELD_PENALTIES = {
+    "name": 30,
+    "license_number": 30,
+    "npi": 30,
+    "phone": 25,
+    "specialty": 25,
+    "address": 20,
+    "city": 20,
+    "state": 20,
+    "zip": 20,
+}
+
+
+def compare_provider_records(db_data: dict, scraped_data: dict) -> list:
+    """
+    Compares database and scraped provider records field by field and
+    returns the list of discrepancies (dicts with field/db_value/
+    scraped_value keys), ignoring minor formatting variations.
+    """
+    discrepancies: list = []
+
+    # Normalize both records in one pass (case-insensitive, strip whitespace)
+    # into tuples aligned with FIELDS_TO_COMPARE; zipping tuples avoids the
+    # per-field dict lookups in the comparison loop
+    db_vals = tuple(str(db_data.get(f, "")).lower().strip() for f in FIELDS_TO_COMPARE)
+    scraped_vals = tuple(str(scraped_data.get(f, "")).lower().strip() for f in FIELDS_TO_COMPARE)
+
+    # Compare all fields and identify discrepancies, short-circuiting the
+    # common equal case before any heuristic work
+    for field, db_normalized, scraped_normalized in zip(FIELDS_TO_COMPARE, db_vals, scraped_vals):
+        if db_normalized == scraped_normalized:
+            continue
+
+        # Minor variation (e.g., "Dr" vs "Drive", "Area" added): one value
+        # contained in the other
+        if db_normalized in scraped_normalized or scraped_normalized in db_normalized:
+            continue
+
+        # Address-specific: a single extra word is treated as a formatting
+        # variation, not a discrepancy
+        if field == "address" and len(db_normalized.split()) == len(scraped_normalized.split()) - 1:
+            continue
+
+        discrepancies.append({
+            "field": field,
+            "db_value": str(db_data.get(field, "")),
+            "scraped_value": str(scraped_data.get(field, ""))
+        })
+
+    return discrepancies
+
+
+def compute_confidence(discrepancies: list) -> int:
+    """
+    Closed-form confidence score (0-100) derived from the discrepancy list.
+    A clean comparison scores 95; each discrepancy subtracts its field's
+    penalty from 100, floored at 0.
+    """
+    if not discrepancies:
+        return 95
+    penalty = 0
+    for d in discrepancies:
+        penalty += _FIELD_PENALTIES.get(d["field"], 20)
+    if penalty > 100:
+        return 0
+    return 100 - penalty